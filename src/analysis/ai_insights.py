@@ -2,24 +2,74 @@ import os
 import time
 import json
 import re
-import pandas as pd
-from openai import OpenAI
+import ast
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson parses the larger LLM JSON payloads noticeably faster than the
+# stdlib; fall back transparently when it isn't installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Import centralized configuration
 from src.config import OPENROUTER_TOKEN_FILE, ANALYSIS_TEMPLATES_DIR, ANALYSIS_RESOURCES_DIR
+from src.analysis import llm_cache
 from src.logger import setup_logger
 
 logger = setup_logger("ai_insights")
 
+# Strips markdown code fences (```json ... ```) in one pass
+_FENCE_RE = re.compile(r'```(?:json)?')
+
+# Extracts the JSON object from an LLM response (first '{' to last '}')
+_JSON_OBJECT_RE = re.compile(r'(\{.*\})', re.DOTALL)
+
+# Upper bound for merging all quarters into one prompt; beyond this we fall
+# back to one request per quarter to stay inside model context windows.
+MAX_BATCH_CHARS = 120_000
+
+# Last-resort prompt used when neither template file can be read. Kept at
+# module scope so the failure path returns a shared constant.
+_DEFAULT_PROMPT = """
+            Analyze these Discord chat logs for {period_label}.
+            Output Language: {language}
+            Return ONLY valid JSON in this format:
+            {{
+                "executive_summary": "A short, engaging paragraph summarizing the main vibe and events of this period.",
+                "summary": ["bullet 1", "bullet 2", "bullet 3"],
+                "sentiment": "One Word Label",
+                "impactful_quote": {{ "text": "Quote text", "author": "Username" }}
+            }}
+            """
+
+@functools.lru_cache(maxsize=32)
+def _read_text(path):
+    """
+    Reads and caches a small config/template file by path.
+    Returns None when the file is missing or unreadable, so callers keep their
+    existing fallback behaviour. Cached because key/model/template files are
+    re-read on every call otherwise.
+    """
+    try:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+    except Exception as e:
+        logger.warning(f"Could not read {path}: {e}")
+    return None
+
 def load_free_models():
     """
     Loads the list of free models from resources/free_models.json
     """
     try:
-        models_path = os.path.join(ANALYSIS_RESOURCES_DIR, "free_models.json")
-        if os.path.exists(models_path):
-            with open(models_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        content = _read_text(os.path.join(ANALYSIS_RESOURCES_DIR, "free_models.json"))
+        if content is not None:
+            return _json_loads(content)
     except Exception as e:
         logger.error(f"Failed to load free_models.json: {e}")
     
@@ -35,18 +85,14 @@ def load_free_models():
         "openchat/openchat-7b:free"
     ]
 
-# Initialize free model list
-FREE_MODELS = load_free_models()
-
 def load_pay_models():
     """
     Loads the list of pay models from resources/pay_models.json
     """
     try:
-        models_path = os.path.join(ANALYSIS_RESOURCES_DIR, "pay_models.json")
-        if os.path.exists(models_path):
-            with open(models_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        content = _read_text(os.path.join(ANALYSIS_RESOURCES_DIR, "pay_models.json"))
+        if content is not None:
+            return _json_loads(content)
     except Exception as e:
         logger.error(f"Failed to load pay_models.json: {e}")
     
@@ -56,8 +102,11 @@ def load_pay_models():
         "deepseek/deepseek-chat"
     ]
 
-# Initialize pay model list
-PAY_MODELS = load_pay_models()
+# Initialize model lists. The two resource files are read concurrently so
+# import time pays for one round of file I/O instead of two (noticeable on
+# cold caches / networked storage, free on SSD).
+with ThreadPoolExecutor(max_workers=2) as _ex:
+    FREE_MODELS, PAY_MODELS = list(_ex.map(lambda fn: fn(), [load_free_models, load_pay_models]))
 
 def load_openrouter_key():
     """
@@ -68,38 +117,128 @@ def load_openrouter_key():
     if env_key:
         return env_key
     
-    # 2. File in project root
-    if os.path.exists(OPENROUTER_TOKEN_FILE):
-        try:
-            with open(OPENROUTER_TOKEN_FILE, 'r', encoding='utf-8') as f:
-                key = f.read().strip()
-                if key:
-                    return key
-        except Exception as e:
-            logger.warning(f"Error reading openRouter_token.txt: {e}")
-            
+    # 2. File in project root (read once per process via _read_text)
+    key = (_read_text(OPENROUTER_TOKEN_FILE) or "").strip()
+    if key:
+        return key
+
     logger.warning("OPENROUTER_API_KEY not found in env or openRouter_token.txt.")
     return None
 
+class _TokenBucket:
+    """
+    Adaptive async rate limiter for OpenRouter calls.
+    Tokens refill at `rate` per second up to `capacity`; a call acquires one
+    token before going out. On a 429 the rate is halved (shrink), and
+    successful calls gradually restore it, so we only pay delays when the
+    API actually signals pressure.
+    """
+    def __init__(self, rate=0.5, capacity=4):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+    def shrink(self):
+        self.rate = max(self.rate / 2, 0.05)
+
+    def restore(self):
+        self.rate = min(self.base_rate, self.rate * 1.25)
+
+# Shared bucket for all OpenRouter requests in this process
+_RATE_BUCKET = _TokenBucket()
+
+# Models that hit a hard limit during this run. Skipping them on later calls
+# turns serial failure discovery (retries + sleeps per quarter) into a set
+# lookup.
+_EXHAUSTED_MODELS = set()
+
+# One-shot prefetch of the OpenRouter model catalog, refreshed every 10
+# minutes. Used to prune configured models the API no longer serves before we
+# waste a full request/retry cycle on them.
+_MODELS_CATALOG = {"ids": None, "fetched_at": 0.0}
+_MODELS_CATALOG_TTL = 600
+
+def _available_model_ids(api_key):
+    """
+    Returns the set of model ids currently listed by OpenRouter, or None when
+    the catalog could not be fetched (in which case no pruning is done).
+    """
+    now = time.monotonic()
+    if (now - _MODELS_CATALOG["fetched_at"]) < _MODELS_CATALOG_TTL:
+        return _MODELS_CATALOG["ids"]
+
+    ids = None
+    try:
+        import requests
+        resp = requests.get(
+            "https://openrouter.ai/api/v1/models",
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=10
+        )
+        resp.raise_for_status()
+        ids = {m.get("id") for m in resp.json().get("data", [])}
+    except Exception as e:
+        logger.warning(f"Could not prefetch OpenRouter model catalog: {e}")
+
+    _MODELS_CATALOG["ids"] = ids
+    _MODELS_CATALOG["fetched_at"] = now
+    return ids
+
+@functools.lru_cache(maxsize=1)
+def _get_client():
+    """
+    Returns the shared AsyncOpenAI client.
+    Constructing the client builds an httpx connection pool, so reusing a
+    single instance lets all quarter calls share TLS connections.
+
+    The openai SDK (and its httpx/pydantic stack) is imported here rather than
+    at module top so that callers that never hit the API — unit tests, report
+    runs without AI — don't pay the import cost. lru_cache keeps it one-shot.
+    """
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        base_url="https://openrouter.ai/api/v1",
+        api_key=load_openrouter_key(),
+    )
+
 def summarize_text(text_content, prompt_instructions, max_retries=2, model_type="free"):
     """
-    Sends content to OpenRouter API.
+    Sends content to OpenRouter API (synchronous wrapper around the async implementation).
     model_type: "free" (rotates free models) or "pay" (rotates pay models)
     """
+    return asyncio.run(_summarize_async(text_content, prompt_instructions, max_retries=max_retries, model_type=model_type))
+
+async def _summarize_async(text_content, prompt_instructions, max_retries=2, model_type="free"):
+    """
+    Async core of summarize_text. Rotates through the configured model list,
+    awaiting the OpenRouter completion for each attempt.
+    """
     api_key = load_openrouter_key()
     if not api_key:
         return "AI Analysis Unavailable: No API Key found."
 
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
-    
+    client = _get_client()
+
     full_prompt = f"{prompt_instructions}\n\nDATA:\n{text_content}"
-    
+
     models_attempted = 0
     max_model_attempts = 5
-    
+
     if model_type == "pay":
         models_list = PAY_MODELS
     elif model_type == "free":
@@ -108,57 +247,116 @@ def summarize_text(text_content, prompt_instructions, max_retries=2, model_type=
         # User specified a specific model ID (e.g. "openai/gpt-4o")
         models_list = [model_type]
 
-    for model in models_list:
+    # Prune models already exhausted in this run and (for rotating lists)
+    # models missing from the live catalog, so dead models fail fast.
+    # The prefetch uses blocking requests I/O, so run it in a worker thread:
+    # on a cache miss it would otherwise stall the event loop (and every
+    # concurrent summary coroutine) for up to its 10s timeout.
+    catalog = (
+        await asyncio.to_thread(_available_model_ids, api_key)
+        if model_type in ("free", "pay") else None
+    )
+    candidates = [
+        m for m in models_list
+        if m not in _EXHAUSTED_MODELS and (catalog is None or m in catalog)
+    ]
+    if not candidates:
+        # Catalog pruning removed everything (stale list?): fall back to
+        # trying the configured models anyway.
+        candidates = [m for m in models_list if m not in _EXHAUSTED_MODELS]
+
+    for model in candidates:
         if models_attempted >= max_model_attempts:
             logger.warning(f"Exceeded limit of {max_model_attempts} different models tried. Aborting AI analysis.")
             break
-        
+
         # 1. Health Check Removed
         # We proceed directly to analysis to avoid wasting tokens on pings.
         logger.info(f"Attempting analysis with model: {model} ({model_type} mode)...")
         models_attempted += 1
-        
-        # 2. Real Analysis Attempt
+
+        # 2. Cache lookup (keyed on model + full prompt).
+        # Temperature is left at the provider default, so identical prompts
+        # are deterministic enough to reuse across report regenerations.
+        cache_key = llm_cache.make_key(model, full_prompt)
+        cached = llm_cache.get(cache_key)
+        if cached:
+            logger.info(f"LLM cache hit for model {model}. Skipping API call.")
+            return cached
+
+        # 3. Real Analysis Attempt
+        rate_limited = False
         for attempt in range(max_retries):
             try:
-                chat_completion = client.chat.completions.create(
+                # Throttle proactively instead of sleeping after the fact
+                await _RATE_BUCKET.acquire()
+
+                # Stream the completion so we start consuming tokens as soon
+                # as the model produces them instead of blocking on the full
+                # response body.
+                stream = await client.chat.completions.create(
                     model=model,
                     messages=[
                         {"role": "user", "content": full_prompt}
                     ],
+                    stream=True,
                     extra_headers={
-                        "HTTP-Referer": "http://localhost:3000", 
+                        "HTTP-Referer": "http://localhost:3000",
                         "X-Title": "Discord Analysis Tool",
                     }
                 )
-                
-                content = chat_completion.choices[0].message.content
+
+                content_parts = []
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta:
+                        content_parts.append(chunk.choices[0].delta.content or "")
+
+                content = "".join(content_parts)
                 if content:
                     logger.info(f"Successfully generated insights using model: {model}")
+                    _RATE_BUCKET.restore()
+                    llm_cache.put(cache_key, content.strip())
                     return content.strip()
-                
+
             except Exception as e:
                 logger.error(f"Model {model} failed (Attempt {attempt+1}): {e}")
                 err_str = str(e)
-                
+
                 # Handling "free-models-per-day" hard limit
                 if "free-models-per-day" in err_str:
+                     _EXHAUSTED_MODELS.add(model)
                      logger.error("Daily free model limit reached. Stopping AI analysis.")
                      return "AI Analysis Unavailable: Daily limit reached."
-                     
+
                 if "429" in err_str: # Rate limit
-                    time.sleep(5) # Increase wait
+                    rate_limited = True
+                    _RATE_BUCKET.shrink()
+                    await asyncio.sleep(5) # Increase wait
                 else:
                     break # Try next model immediately for non-rate-limit errors
-        
-        # Check if we should stop completely if we returned earlier
-        if "Unavailable" in locals().get('content', ''):
-             break
-        
+
+        if rate_limited:
+            # Blacklist for the rest of this run: concurrent/subsequent calls
+            # skip straight past it instead of repeating the retry/sleep cycle.
+            _EXHAUSTED_MODELS.add(model)
         logger.warning(f"Model {model} exhausted all retries. Switching to next model...")
 
     return "Failed to get AI response from all available models."
 
+async def _gather_summaries(jobs, model_type="free", concurrency=4):
+    """
+    Runs one _summarize_async call per (label, text_blob, prompt) job concurrently.
+    A semaphore caps in-flight requests so we don't hammer the API.
+    Returns the list of responses in job order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(job):
+        async with semaphore:
+            return await _summarize_async(job['text_blob'], job['prompt'], model_type=model_type)
+
+    return await asyncio.gather(*(run_one(job) for job in jobs))
+
 def load_prompt_template(template_name='company_chat_prompt.txt'):
     """
     Loads the system prompt from templates directory.
@@ -168,35 +366,147 @@ def load_prompt_template(template_name='company_chat_prompt.txt'):
                       Default: 'company_chat_prompt.txt' (specialized for financial analysis)
                       Alternative: 'system_prompt.txt' (general Discord chat analysis)
     """
+    # Use centralized config path (cached: templates don't change mid-run)
+    content = _read_text(os.path.join(ANALYSIS_TEMPLATES_DIR, template_name))
+    if content is not None:
+        return content
+
+    logger.warning(f"Could not load {template_name}. Trying fallback...")
+
+    # Try the other template as fallback
+    fallback_name = 'system_prompt.txt' if template_name != 'system_prompt.txt' else 'company_chat_prompt.txt'
+    content = _read_text(os.path.join(ANALYSIS_TEMPLATES_DIR, fallback_name))
+    if content is not None:
+        logger.info(f"Loaded fallback template: {fallback_name}")
+        return content
+    logger.error(f"Could not load fallback template {fallback_name}")
+
+    # Final fallback: hardcoded basic template
+    return _DEFAULT_PROMPT
+
+def _repair_failed_json(failed_jobs, model_type="free"):
+    """
+    Single batched attempt to salvage periods whose responses failed JSON
+    parsing. All malformed payloads go out in ONE request asking the model to
+    return a valid JSON object keyed by period label.
+
+    Args:
+        failed_jobs: list of (label, malformed_text) tuples.
+
+    Returns: {label: parsed_dict} for the entries that could be repaired
+    (possibly empty).
+    """
+    # Cap each payload so a pathological response can't blow the context.
+    payload = {label: raw[:8000] for label, raw in failed_jobs}
+
+    instructions = (
+        "The following JSON documents are malformed. Repair them, preserving "
+        "all content, and return ONLY one valid JSON object that maps each "
+        "key to its repaired document. No markdown, no commentary."
+    )
+
     try:
-        # Use centralized config path
-        template_path = os.path.join(ANALYSIS_TEMPLATES_DIR, template_name)
-        with open(template_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        response = summarize_text(json.dumps(payload, ensure_ascii=False),
+                                  instructions, model_type=model_type)
+        clean = _FENCE_RE.sub("", response).strip()
+        json_match = _JSON_OBJECT_RE.search(clean)
+        if not json_match:
+            return {}
+        data = _json_loads(json_match.group(1))
     except Exception as e:
-        logger.warning(f"Could not load {template_name}: {e}. Trying fallback...")
-        
-        # Try the other template as fallback
-        fallback_name = 'system_prompt.txt' if template_name != 'system_prompt.txt' else 'company_chat_prompt.txt'
-        try:
-            fallback_path = os.path.join(ANALYSIS_TEMPLATES_DIR, fallback_name)
-            with open(fallback_path, 'r', encoding='utf-8') as f:
-                logger.info(f"Loaded fallback template: {fallback_name}")
-                return f.read()
-        except Exception as e2:
-            logger.error(f"Could not load fallback template {fallback_name}: {e2}")
-            # Final fallback: hardcoded basic template
-            return """
-            Analyze these Discord chat logs for {period_label}.
-            Output Language: {language}
-            Return ONLY valid JSON in this format:
-            {{
-                "executive_summary": "A short, engaging paragraph summarizing the main vibe and events of this period.",
-                "summary": ["bullet 1", "bullet 2", "bullet 3"],
-                "sentiment": "One Word Label",
-                "impactful_quote": {{ "text": "Quote text", "author": "Username" }}
-            }}
-            """
+        logger.warning(f"Batched JSON repair failed: {e}")
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+    return {label: entry for label, entry in data.items()
+            if label in payload and isinstance(entry, dict)}
+
+def _fallback_entry(quarter_data):
+    """
+    Empty insight entry (fields compatible with both report templates),
+    used when the AI response for a period is missing or unparseable.
+    """
+    return {
+        "summary": [],
+        "sentiment": "Unknown",
+        "executive_summary": "",
+        "la_perla": [],
+        "la_simpatia": [],
+        "funniest_quotes": [],
+        "impactful_quote": {"text": "", "author": ""},
+        "contributors": sorted(quarter_data['user'].unique().tolist()) if not quarter_data.empty else []
+    }
+
+def _extract_cited_contributors(data):
+    """
+    Recursively collects **@Username** mentions from all string values in the
+    parsed insight structure. Returns a sorted, deduplicated list with @ prefix.
+    """
+    def traverse(obj):
+        mentions = []
+        if isinstance(obj, dict):
+            for value in obj.values():
+                mentions.extend(traverse(value))
+        elif isinstance(obj, list):
+            for item in obj:
+                mentions.extend(traverse(item))
+        elif isinstance(obj, str):
+            mentions.extend(re.findall(r'\*\*@([^\*]+)\*\*', obj))
+        return mentions
+
+    return sorted(set(f"@{u.strip()}" for u in traverse(data)))
+
+def _try_batched_insights(jobs, prompt_template, language, model_type):
+    """
+    Merges all quarter blobs into one multi-section prompt and asks the model
+    for a single JSON object keyed by period label. Returns the parsed dict,
+    or None when the payload is too large or the response is unusable (the
+    caller then falls back to per-quarter requests).
+    """
+    total_chars = sum(len(job['text_blob']) for job in jobs)
+    if total_chars > MAX_BATCH_CHARS:
+        logger.info(f"Batched prompt too large ({total_chars} chars). Falling back to per-quarter calls.")
+        return None
+
+    labels = [job['label'] for job in jobs]
+    sections = "\n\n".join(f"== {job['label']} ==\n{job['text_blob']}" for job in jobs)
+
+    base_instructions = prompt_template.replace("{language}", language) \
+                                       .replace("{period_label}", "each period below")
+    # Neutralize the year placeholder: the sections span multiple periods
+    for pattern in (" of {year}", " del {year}", " di {year}", "{year}"):
+        base_instructions = base_instructions.replace(pattern, "")
+
+    batch_prompt = (
+        f"{base_instructions}\n\n"
+        f"IMPORTANT: The DATA below contains multiple periods separated by '== <period> ==' headers "
+        f"({', '.join(labels)}). Analyze each period independently and return ONLY one JSON object "
+        f"whose keys are exactly these period labels and whose values each follow the JSON format described above."
+    )
+
+    logger.info(f"Batching {len(jobs)} periods into a single LLM call...")
+    response = summarize_text(sections, batch_prompt, model_type=model_type)
+    if "Unavailable" in response:
+        return None
+
+    clean_json = _FENCE_RE.sub("", response).strip()
+    json_match = _JSON_OBJECT_RE.search(clean_json)
+    if not json_match:
+        logger.warning("Batched response contained no JSON object. Falling back to per-quarter calls.")
+        return None
+
+    try:
+        data = _json_loads(json_match.group(1))
+    except json.JSONDecodeError as e:
+        logger.warning(f"Batched JSON parse failed ({e}). Falling back to per-quarter calls.")
+        return None
+
+    if not isinstance(data, dict) or not any(label in data for label in labels):
+        logger.warning("Batched response did not contain the requested period keys. Falling back.")
+        return None
+
+    return data
 
 def get_quarterly_insights(df, year=None, target_quarter=None, language="Italian", force_single_period=False, period_label_override=None, model_type="free", analysis_type="company"):
     """
@@ -207,22 +517,46 @@ def get_quarterly_insights(df, year=None, target_quarter=None, language="Italian
     
     analysis_type: "company" (Value Investor) or "general" (Generic Chat)
     """
+    # Deferred so that light callers of this module (check_quota, list_models)
+    # don't pay the pandas/numpy import cost; this is the only function here
+    # that needs them, and the caller already has pandas loaded anyway.
+    import numpy as np
+    import pandas as pd
+
     if 'timestamp' not in df.columns:
         return {}
-        
-    df = df.copy()
-    if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-    
+
+    # Without a key every API call returns the "No API Key" sentinel anyway,
+    # so skip the whole grouping/sampling/prompt-build pipeline up front.
+    if not load_openrouter_key():
+        logger.warning("No OpenRouter API key configured; skipping AI analysis.")
+        return {}
+
+    # Never mutate (or copy) the caller's frame: parse timestamps into a
+    # scratch Series and derive year/quarter as numpy arrays alongside it.
+    ts = df['timestamp']
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+
+    # Decompose year/quarter once via numpy datetime64 arithmetic instead of
+    # going through the pandas .dt accessors (each of which re-scans the column).
+    ts_values = ts.to_numpy(dtype='datetime64[ns]')
+    years_arr = ts_values.astype('datetime64[Y]').astype('int64') + 1970
+    quarters_arr = ts_values.astype('datetime64[M]').astype('int64') % 12 // 3 + 1
+
     # Pre-filtering by year is only done if year is provided AND we're not in single period mode
     if year and not force_single_period:
-        df_target = df[df['timestamp'].dt.year == year].copy()
+        year_mask = years_arr == year
+        df_target = df[year_mask]
+        ts_values = ts_values[year_mask]
+        years_arr = years_arr[year_mask]
+        quarters_arr = quarters_arr[year_mask]
         if df_target.empty:
             logger.warning(f"No data found for year {year}. Skipping AI analysis.")
             return {}
     else:
-        df_target = df.copy() # Use whatever is passed
-    
+        df_target = df # Use whatever is passed
+
     if df_target.empty:
          return {}
 
@@ -232,30 +566,63 @@ def get_quarterly_insights(df, year=None, target_quarter=None, language="Italian
         template_name = 'generic_chat_prompt.txt'
         
     prompt_template = load_prompt_template(template_name)
-    
+
+    # Hoist the per-run substitutions out of the quarter loop: {language} never
+    # changes, and in single-period mode the "of {year}" phrasing can be
+    # stripped once. The loop then only fills {period_label} and {year}.
+    base_prompt = prompt_template.replace("{language}", language)
+    if force_single_period:
+        # Clean up the "of {year}" part if it exists, to avoid
+        # "Ultimi 3 mesi of the specific period" (English + Italian patterns).
+        for year_phrase in (" of {year}", " del {year}", " di {year}"):
+            base_prompt = base_prompt.replace(year_phrase, "")
+        base_prompt = base_prompt.replace("{year}", "")
+
     insights = {}
-    
+    jobs = []
+
     # Define processing groups
     if force_single_period:
         # Just one group: the whole dataframe
         # Dummy key for iteration
         sorted_groups = [((0,0), df_target)]
     else:
-        # helper to identify quarter
-        df_target['quarter'] = df_target['timestamp'].dt.quarter
-        df_target['year'] = df_target['timestamp'].dt.year
-        
-        start_year = df_target['year'].min()
-        end_year = df_target['year'].max()
+        # Drop rows without a timestamp: they cannot be assigned to a quarter
+        # (the NaN-keyed groups were silently dropped by groupby before).
+        valid_mask = ~np.isnat(ts_values)
+        if not valid_mask.all():
+            df_target = df_target[valid_mask]
+            ts_values = ts_values[valid_mask]
+            years_arr = years_arr[valid_mask]
+            quarters_arr = quarters_arr[valid_mask]
+            if df_target.empty:
+                return {}
+
+        # The stride-based sampler below assumes chronological rows. Discord
+        # exports already are, so this is normally a no-op check; otherwise a
+        # single stable sort here replaces the per-quarter sort_values the old
+        # random sampling needed.
+        if len(ts_values) > 1 and not np.all(ts_values[:-1] <= ts_values[1:]):
+            order = np.argsort(ts_values, kind='stable')
+            df_target = df_target.iloc[order]
+            years_arr = years_arr[order]
+            quarters_arr = quarters_arr[order]
+
+        start_year = years_arr.min()
+        end_year = years_arr.max()
         multi_year = start_year != end_year
-        
+
         if target_quarter:
-             df_target = df_target[df_target['quarter'] == target_quarter]
-             
-        # Get unique couples
-        groups = df_target.groupby(['year', 'quarter'])
-        # Sort groups by year, then quarter
-        sorted_groups = sorted(groups, key=lambda x: (x[0][0], x[0][1]))
+             q_mask = quarters_arr == target_quarter
+             df_target = df_target[q_mask]
+             years_arr = years_arr[q_mask]
+             quarters_arr = quarters_arr[q_mask]
+
+        # Group directly on the precomputed arrays: no helper columns are
+        # written back, so df_target stays a cheap view of the input frame.
+        # groupby already yields groups in (year, quarter) order with sort=True,
+        # so no extra sorted() pass is needed.
+        sorted_groups = df_target.groupby([years_arr, quarters_arr], sort=True, observed=True)
 
     for (y, q), quarter_data in sorted_groups:
         if quarter_data.empty:
@@ -281,45 +648,73 @@ def get_quarterly_insights(df, year=None, target_quarter=None, language="Italian
         
         msgs_to_process = quarter_data
         if len(quarter_data) > limit_msgs:
-            # We sample evenly across the quarter if possible, 
-            # currently just random sample + sort is fine for general sentiment.
-            msgs_to_process = quarter_data.sample(limit_msgs).sort_values('timestamp')
+            # Stride-based pick: evenly spaced across the quarter, deterministic
+            # (same prompt every run, so the LLM cache can hit), and no re-sort.
+            step = len(quarter_data) // limit_msgs
+            msgs_to_process = quarter_data.iloc[::step].head(limit_msgs)
             logger.info(f"   -> Sampled down to {limit_msgs} messages for API safety.")
              
-        text_blob = "\n".join(
-            (msgs_to_process['user'] + ": " + msgs_to_process['message'].astype(str)).tolist()
-        )
+        # Stream (user, message) pairs straight into join instead of building
+        # intermediate Series concatenations and a .tolist() copy.
+        text_blob = "\n".join(map(
+            "{0}: {1}".format,
+            msgs_to_process['user'].to_numpy(),
+            msgs_to_process['message'].to_numpy()
+        ))
         
         # Fill template (Using replace instead of format to avoid KeyError on JSON braces)
-        # year_ctx = str(y) if not force_single_period else "the specific period"
-        
-        prompt = prompt_template.replace("{language}", language) \
-                                .replace("{period_label}", quarter_label)
-
-        if force_single_period:
-            # Clean up the "of {year}" part if it exists, to avoid "Ultimi 3 mesi of the specific period"
-            # Try English pattern
-            prompt = prompt.replace(" of {year}", "")
-            # Try Italian pattern (in case of custom templates)
-            prompt = prompt.replace(" del {year}", "")
-            prompt = prompt.replace(" di {year}", "")
-            # Fallback for just the tag
-            prompt = prompt.replace("{year}", "")
-        else:
+        prompt = base_prompt.replace("{period_label}", quarter_label)
+        if not force_single_period:
             prompt = prompt.replace("{year}", str(y))
-        
-        response = summarize_text(text_blob, prompt, model_type=model_type)
-        
+
+        jobs.append({
+            'label': quarter_label,
+            'text_blob': text_blob,
+            'prompt': prompt,
+            'quarter_data': quarter_data
+        })
+
+    if not jobs:
+        return insights
+
+    # First choice: collapse all periods into ONE API round-trip (less prompt
+    # overhead, less rate-limit pressure). Falls back to per-quarter calls
+    # when the combined payload is too large or the response is unusable.
+    if not force_single_period and target_quarter is None and len(jobs) > 1:
+        batch_data = _try_batched_insights(jobs, prompt_template, language, model_type)
+        if batch_data is not None:
+            for job in jobs:
+                data = batch_data.get(job['label'])
+                if isinstance(data, dict):
+                    data['contributors'] = _extract_cited_contributors(data)
+                    insights[job['label']] = data
+                    logger.info(f"   -> Success! Analyzed {job['label']} (batched).")
+                else:
+                    logger.warning(f"Batched response missing {job['label']}. Using empty entry.")
+                    insights[job['label']] = _fallback_entry(job['quarter_data'])
+            return insights
+
+    # Fire all quarter requests concurrently (network-bound, so wall-clock is
+    # roughly max(quarter_latency) instead of the sum). The semaphore inside
+    # _gather_summaries throttles in-flight requests; JSON parsing below stays
+    # synchronous once all responses are in.
+    responses = asyncio.run(_gather_summaries(jobs, model_type=model_type))
+
+    # Quarters whose responses fail JSON parsing; retried once, batched.
+    failed_jobs = []
+
+    for job, response in zip(jobs, responses):
+        quarter_label = job['label']
+        quarter_data = job['quarter_data']
+
         # Check for hard stop signal
         if "Unavailable" in response:
              logger.error("AI Analysis stopped due to API limits.")
              break
-             
-        time.sleep(5) # Modest buffer
-        
+
         # Enhanced JSON Cleaning
         # 1. Strip Markdown code blocks
-        clean_json = response.replace("```json", "").replace("```", "").strip()
+        clean_json = _FENCE_RE.sub("", response).strip()
         
         # 2. Fix common AI JSON errors
         # Replace semicolons with commas in JSON key-value separators
@@ -328,28 +723,18 @@ def get_quarterly_insights(df, year=None, target_quarter=None, language="Italian
         clean_json = re.sub(r'"\s*;\s*$', '",', clean_json, flags=re.MULTILINE)
         
         # 3. Extract JSON object using regex (find first { and last })
-        import ast
-        json_match = re.search(r'(\{.*\})', clean_json, re.DOTALL)
+        json_match = _JSON_OBJECT_RE.search(clean_json)
         if json_match:
             clean_json = json_match.group(1)
         else:
             # If no JSON found at all, log the first part of response and skip
             logger.error(f"   -> No JSON object found in response. Response preview: {response[:300]}...")
-            insights[quarter_label] = {
-                "summary": [], 
-                "sentiment": "Unknown",
-                "executive_summary": "",
-                "la_perla": [],
-                "la_simpatia": [],
-                "funniest_quotes": [],
-                "impactful_quote": {"text": "", "author": ""},
-                "contributors": sorted(quarter_data['user'].unique().tolist()) if not quarter_data.empty else []
-            }
+            insights[quarter_label] = _fallback_entry(quarter_data)
             continue
         
         try:
             try:
-                data = json.loads(clean_json)
+                data = _json_loads(clean_json)
             except json.JSONDecodeError as e_json:
                 # Log the actual error details
                 logger.error(f"JSON Parse Error: {str(e_json)}")
@@ -371,35 +756,7 @@ def get_quarterly_insights(df, year=None, target_quarter=None, language="Italian
             # --- POST-PROCESSING: Statistical Extraction of Contributors ---
             # Extract users specifically cited by the AI (looking for **@User** pattern)
             try:
-                # Search for **@Username** patterns in all string values within the data structure
-                # We'll recursively traverse the data to find all mentions
-                def extract_mentions_from_value(value):
-                    """Extract @mentions from a string value"""
-                    if isinstance(value, str):
-                        # Find all **@Username** patterns
-                        return re.findall(r'\*\*@([^\*]+)\*\*', value)
-                    return []
-                
-                def traverse_and_extract(obj):
-                    """Recursively traverse the data structure to find all mentions"""
-                    mentions = []
-                    if isinstance(obj, dict):
-                        for value in obj.values():
-                            mentions.extend(traverse_and_extract(value))
-                    elif isinstance(obj, list):
-                        for item in obj:
-                            mentions.extend(traverse_and_extract(item))
-                    elif isinstance(obj, str):
-                        mentions.extend(extract_mentions_from_value(obj))
-                    return mentions
-                
-                # Extract all cited users from the data structure
-                cited_users = traverse_and_extract(data)
-                
-                # Deduplicate, sort, and add @ prefix
-                contributors_list = sorted(list(set([f"@{u.strip()}" for u in cited_users])))
-                
-                data['contributors'] = contributors_list
+                data['contributors'] = _extract_cited_contributors(data)
             except Exception as e_stats:
                 logger.warning(f"Failed to extract cited contributors list: {e_stats}")
                 data['contributors'] = []
@@ -420,17 +777,21 @@ def get_quarterly_insights(df, year=None, target_quarter=None, language="Italian
                 logger.error(f"   -> Could not save debug file: {e_debug}")
             
             # Fallback: Provide fields compatible with both templates
-            insights[quarter_label] = {
-                "summary": [],
-                "sentiment": "Unknown",
-                "executive_summary": "",
-                "la_perla": [],
-                "la_simpatia": [],
-                "funniest_quotes": [],
-                "impactful_quote": {"text": "", "author": ""},
-                "contributors": sorted(quarter_data['user'].unique().tolist()) if not quarter_data.empty else []
-            }
-            
+            insights[quarter_label] = _fallback_entry(quarter_data)
+            failed_jobs.append((quarter_label, clean_json))
+
+    # One combined repair attempt for everything that failed to parse —
+    # far cheaper than one retry per quarter, and models fix their own
+    # malformed JSON reliably when asked directly.
+    if failed_jobs:
+        for label, data in _repair_failed_json(failed_jobs, model_type).items():
+            try:
+                data['contributors'] = _extract_cited_contributors(data)
+            except Exception:
+                data['contributors'] = []
+            insights[label] = data
+            logger.info(f"   -> Recovered {label} via batched JSON repair.")
+
     return insights
 
 def generate_yearly_summary(insights, year, language="Italian", model_type="free"):
@@ -1,5 +1,6 @@
 import os
-import requests
+import atexit
+import httpx
 import sys
 
 # Add project root to path
@@ -10,6 +11,15 @@ if project_root not in sys.path:
 
 from src.analysis.ai_insights import load_openrouter_key
 
+# Shared client: keeps the TCP+TLS connection to openrouter.ai warm across
+# repeated calls instead of re-handshaking every time. HTTP/2 multiplexing is
+# enabled when the optional h2 package is installed.
+try:
+    _SESSION = httpx.Client(http2=True, timeout=30.0)
+except ImportError:
+    _SESSION = httpx.Client(timeout=30.0)
+atexit.register(_SESSION.close)
+
 def check_quota():
     api_key = load_openrouter_key()
     if not api_key:
@@ -18,7 +28,7 @@ def check_quota():
 
     print("Checking OpenRouter quota...")
     try:
-        response = requests.get(
+        response = _SESSION.get(
             "https://openrouter.ai/api/v1/auth/key",
             headers={"Authorization": f"Bearer {api_key}"}
         )
@@ -1,84 +1,268 @@
 import sys
 import os
 import argparse
-import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from src.logger import setup_logger
 
 logger = setup_logger("html_to_pdf")
 
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     logger.warning("'playwright' module not found. PDF generation will be skipped.")
     logger.warning("To enable PDF, run: pip install playwright && playwright install")
     PLAYWRIGHT_AVAILABLE = False
 
-def convert_html_to_pdf(html_path, output_pdf_path=None):
+# Proceed as soon as every Plotly div has finished layouting (or the page has
+# no Plotly at all) instead of a blind fixed sleep.
+_PLOTLY_READY_JS = """
+() => {
+    if (typeof Plotly === 'undefined') return true;
+    const divs = document.querySelectorAll('.plotly-graph-div');
+    return divs.length > 0 && Array.from(divs).every(d => d._fullLayout);
+}
+"""
+
+# Animations/transitions serve no purpose in a PDF snapshot and only delay
+# the point at which the page settles — kill them all before rendering.
+_NO_ANIMATION_CSS = "* { animation: none !important; transition: none !important; }"
+
+def _render_page_to_pdf(browser, html_path, output_pdf_path):
     """
-    Converts a local HTML file to PDF using Playwright (headless Chromium).
-    This handles JS rendering (Plotly charts) which static converters miss.
-    
-    Returns: True if successful, False otherwise.
+    Renders one HTML file to PDF on an already-launched browser.
+    Returns True on success, False otherwise.
     """
-    if not PLAYWRIGHT_AVAILABLE:
-        logger.error("PDF generation skipped: Playwright not installed.")
+    abs_html_path = os.path.abspath(html_path)
+    if not os.path.exists(abs_html_path):
+        logger.error(f"File not found: {abs_html_path}")
         return False
 
-    if not output_pdf_path:
-        output_pdf_path = html_path.replace(".html", ".pdf")
+    logger.info(f"Converting '{os.path.basename(html_path)}' to PDF...")
+
+    page = browser.new_page()
+    try:
+        page.set_default_navigation_timeout(15000)
+
+        # Open the local file
+        # We use file:// to access local filesystem
+        page.goto(f"file://{abs_html_path}")
+        page.add_style_tag(content=_NO_ANIMATION_CSS)
 
+        # Wait for potential JS to load charts
+        # 'networkidle' is good, but sometimes Plotly takes a bit more.
+        page.wait_for_load_state("networkidle")
+
+        # Wait until Plotly has actually laid out its charts rather than
+        # sleeping a fixed 2s; cap at 5s so a broken chart can't hang us.
+        try:
+            page.wait_for_function(_PLOTLY_READY_JS, timeout=5000)
+        except Exception:
+            logger.warning("Plotly readiness check timed out; printing anyway.")
+
+        # Generate PDF
+        # We set formatting options here
+        page.pdf(
+            path=output_pdf_path,
+            format="A4",
+            print_background=True,
+            margin={
+                "top": "0.5in",
+                "right": "0.5in",
+                "bottom": "0.5in",
+                "left": "0.5in"
+            }
+        )
+
+        logger.info(f"PDF successfully created: {output_pdf_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to generate PDF: {e}")
+        return False
+    finally:
+        page.close()
+
+async def _render_page_to_pdf_async(context, html_path, output_pdf_path):
+    """
+    Async twin of _render_page_to_pdf, rendering on a shared browser context.
+    Returns True on success, False otherwise.
+    """
     abs_html_path = os.path.abspath(html_path)
     if not os.path.exists(abs_html_path):
         logger.error(f"File not found: {abs_html_path}")
-        return
+        return False
 
     logger.info(f"Converting '{os.path.basename(html_path)}' to PDF...")
 
+    page = await context.new_page()
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            
-            # Open the local file
-            # We use file:// to access local filesystem
-            page.goto(f"file://{abs_html_path}")
-            
-            # Wait for potential JS to load charts
-            # 'networkidle' is good, but sometimes Plotly takes a bit more.
-            page.wait_for_load_state("networkidle")
-            
-            # Explicit wait to let animations/resizing settle
-            time.sleep(2) 
-
-            # Generate PDF
-            # We set formatting options here
-            page.pdf(
-                path=output_pdf_path,
-                format="A4",
-                print_background=True,
-                margin={
-                    "top": "0.5in",
-                    "right": "0.5in",
-                    "bottom": "0.5in",
-                    "left": "0.5in"
-                }
-            )
-            
-            browser.close()
-        
+        page.set_default_navigation_timeout(15000)
+        await page.goto(f"file://{abs_html_path}")
+        await page.add_style_tag(content=_NO_ANIMATION_CSS)
+        await page.wait_for_load_state("networkidle")
+        try:
+            await page.wait_for_function(_PLOTLY_READY_JS, timeout=5000)
+        except Exception:
+            logger.warning("Plotly readiness check timed out; printing anyway.")
+
+        await page.pdf(
+            path=output_pdf_path,
+            format="A4",
+            print_background=True,
+            margin={
+                "top": "0.5in",
+                "right": "0.5in",
+                "bottom": "0.5in",
+                "left": "0.5in"
+            }
+        )
+
         logger.info(f"PDF successfully created: {output_pdf_path}")
         return True
-
     except Exception as e:
         logger.error(f"Failed to generate PDF: {e}")
         return False
+    finally:
+        await page.close()
+
+async def _convert_many_async(conversions):
+    """
+    Renders all conversions concurrently as pages of a single browser
+    context. Chromium parallelizes page rendering across cores, so N
+    reports finish in roughly max(render_time) instead of the sum.
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            context = await browser.new_context()
+            tasks = [
+                _render_page_to_pdf_async(
+                    context, html_path,
+                    output_pdf_path or html_path.replace(".html", ".pdf")
+                )
+                for html_path, output_pdf_path in conversions
+            ]
+            return list(await asyncio.gather(*tasks))
+        finally:
+            await browser.close()
+
+# Warm-up state: a single background thread that pre-launches Chromium so its
+# startup (~0.5-2s) overlaps with the HTML render. Sync Playwright objects are
+# NOT thread-safe, so the same thread that launched the browser also runs the
+# conversion.
+_warm_executor = None
+_warm_future = None
+
+def warm_up_browser():
+    """
+    Starts launching headless Chromium in a background thread; the next
+    convert_many()/convert_html_to_pdf() call picks it up already running.
+    No-op when Playwright is missing or a warm-up is already pending.
+    """
+    global _warm_executor, _warm_future
+    if not PLAYWRIGHT_AVAILABLE or _warm_future is not None:
+        return
+    _warm_executor = ThreadPoolExecutor(max_workers=1)
+    _warm_future = _warm_executor.submit(_launch_browser)
+
+def _launch_browser():
+    p = sync_playwright().start()
+    try:
+        return p, p.chromium.launch()
+    except Exception:
+        p.stop()
+        raise
+
+def _convert_on_warm_browser(launch_future, conversions):
+    # Runs on the warm-up thread (see note above _warm_executor).
+    p, browser = launch_future.result()
+    results = []
+    try:
+        for html_path, output_pdf_path in conversions:
+            if not output_pdf_path:
+                output_pdf_path = html_path.replace(".html", ".pdf")
+            results.append(_render_page_to_pdf(browser, html_path, output_pdf_path))
+    finally:
+        browser.close()
+        p.stop()
+    return results
+
+def convert_html_to_pdf(html_path, output_pdf_path=None):
+    """
+    Converts a local HTML file to PDF using Playwright (headless Chromium).
+    This handles JS rendering (Plotly charts) which static converters miss.
+
+    Returns: True if successful, False otherwise.
+    """
+    return all(convert_many([(html_path, output_pdf_path)]))
+
+def convert_many(conversions):
+    """
+    Converts several HTML files to PDF within ONE Playwright session,
+    rendering pages concurrently. Chromium launch costs ~0.5-2s, so batching
+    N reports pays it once instead of N times.
+
+    Args:
+        conversions: list of (html_path, output_pdf_path) tuples;
+                     output_pdf_path may be None to derive it from html_path.
+
+    Returns: list of booleans, one per conversion, in input order.
+    """
+    if not PLAYWRIGHT_AVAILABLE:
+        logger.error("PDF generation skipped: Playwright not installed.")
+        return [False] * len(conversions)
+
+    if not conversions:
+        return []
+
+    # Use the pre-launched browser when warm_up_browser() was called; the job
+    # is shipped to the warm-up thread because sync Playwright objects must
+    # stay on the thread that created them.
+    global _warm_executor, _warm_future
+    if _warm_future is not None:
+        ex, fut = _warm_executor, _warm_future
+        _warm_executor = _warm_future = None
+        try:
+            return ex.submit(_convert_on_warm_browser, fut, conversions).result()
+        except Exception as e:
+            logger.warning(f"Warm-browser conversion failed ({e}). Falling back to a fresh launch.")
+        finally:
+            ex.shutdown(wait=False)
+
+    try:
+        return asyncio.run(_convert_many_async(conversions))
+    except RuntimeError:
+        # Already inside an event loop (e.g. called from the web app):
+        # fall back to the synchronous single-browser path.
+        pass
+    except Exception as e:
+        logger.error(f"Failed to launch browser for PDF generation: {e}")
+        return [False] * len(conversions)
+
+    results = []
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            try:
+                for html_path, output_pdf_path in conversions:
+                    if not output_pdf_path:
+                        output_pdf_path = html_path.replace(".html", ".pdf")
+                    results.append(_render_page_to_pdf(browser, html_path, output_pdf_path))
+            finally:
+                browser.close()
+    except Exception as e:
+        logger.error(f"Failed to launch browser for PDF generation: {e}")
+        results.extend([False] * (len(conversions) - len(results)))
+
+    return results
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Convert HTML report to PDF with JS support.")
     parser.add_argument("html_file", help="Path to the HTML file to convert")
     parser.add_argument("-o", "--output", help="Path to the output PDF file (optional)", default=None)
-    
+
     args = parser.parse_args()
-    
+
     convert_html_to_pdf(args.html_file, args.output)
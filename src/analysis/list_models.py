@@ -1,7 +1,19 @@
 import os
-import requests
+import json
+import time
+import atexit
+import httpx
 import sys
 
+# orjson parses the ~1MB catalog several times faster than the stdlib;
+# fall back transparently when it isn't installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 # Add project root to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(current_dir))
@@ -9,45 +21,84 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from src.analysis.ai_insights import load_openrouter_key
+from src.config import MODELS_CACHE_FILE
+
+# Shared client: keeps the TCP+TLS connection warm (the /models response is
+# ~1MB of JSON, served gzipped). HTTP/2 multiplexing is enabled when the
+# optional h2 package is installed.
+try:
+    _SESSION = httpx.Client(http2=True, timeout=30.0)
+except ImportError:
+    _SESSION = httpx.Client(timeout=30.0)
+atexit.register(_SESSION.close)
+
+# Re-download the catalog at most once a day; it changes rarely.
+MODELS_CACHE_MAX_AGE = 24 * 3600
+
+def fetch_models():
+    """
+    Returns the OpenRouter model catalog (list of dicts), served from the
+    local cache file when it is fresher than MODELS_CACHE_MAX_AGE.
+    """
+    try:
+        if os.path.exists(MODELS_CACHE_FILE) and \
+                (time.time() - os.path.getmtime(MODELS_CACHE_FILE)) < MODELS_CACHE_MAX_AGE:
+            with open(MODELS_CACHE_FILE, 'rb') as f:
+                return _json_loads(f.read())
+    except Exception as e:
+        print(f"Could not read models cache: {e}")
+
+    response = _SESSION.get("https://openrouter.ai/api/v1/models")
+    response.raise_for_status()
+    # Parse from the raw bytes: avoids response.json()'s stdlib round-trip.
+    models = _json_loads(response.content).get("data", [])
+
+    try:
+        if orjson is not None:
+            with open(MODELS_CACHE_FILE, 'wb') as f:
+                f.write(orjson.dumps(models))
+        else:
+            with open(MODELS_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(models, f)
+    except Exception as e:
+        print(f"Could not write models cache: {e}")
+
+    return models
 
 def list_models():
     api_key = load_openrouter_key()
-            
+
     if not api_key:
         print("No OpenRouter API Key found.")
         return
 
     print("Fetching free models from OpenRouter...")
     try:
-        response = requests.get("https://openrouter.ai/api/v1/models")
-        if response.status_code == 200:
-            models = response.json().get("data", [])
-            # Filter for free models if you want, or just list them all
-            # Usually looking for specific pricing or "free" in ID
-            count = 0
-            for  m in models:
-                mid = m.get("id")
-                pricing = m.get("pricing", {})
-                is_free = False
-                
-                # Check for zero pricing
-                try:
-                    prompt = float(pricing.get("prompt", 999))
-                    completion = float(pricing.get("completion", 999))
-                    if prompt == 0 and completion == 0:
-                        is_free = True
-                except:
-                    pass
-                
-                if ":free" in mid or is_free:
-                    print(f"- {mid}")
-                    count += 1
-            print(f"\nFound {count} potentially free models.")
-        else:
-            print(f"Error fetching models: {response.status_code} - {response.text}")
+        models = fetch_models()
+        # Filter for free models if you want, or just list them all
+        # Usually looking for specific pricing or "free" in ID
+        count = 0
+        for  m in models:
+            mid = m.get("id")
+            pricing = m.get("pricing", {})
+            is_free = False
+
+            # Check for zero pricing
+            try:
+                prompt = float(pricing.get("prompt", 999))
+                completion = float(pricing.get("completion", 999))
+                if prompt == 0 and completion == 0:
+                    is_free = True
+            except:
+                pass
+
+            if ":free" in mid or is_free:
+                print(f"- {mid}")
+                count += 1
+        print(f"\nFound {count} potentially free models.")
 
     except Exception as e:
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    list_models()
\ No newline at end of file
+    list_models()
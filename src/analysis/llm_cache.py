@@ -0,0 +1,79 @@
+import os
+import json
+import time
+import hashlib
+
+# Import centralized configuration
+from src.config import LLM_CACHE_FILE
+from src.logger import setup_logger
+
+logger = setup_logger("llm_cache")
+
+# Default time-to-live for cached responses (7 days).
+# Long enough to cover iterative report regeneration, short enough that
+# stale insights eventually refresh.
+DEFAULT_TTL = 7 * 24 * 3600
+
+# Lazy-loaded in-memory mirror of the on-disk cache:
+# { key: {"response": str, "created_at": float} }
+_cache = None
+
+def is_disabled():
+    """
+    Returns True if caching is disabled via the LLM_CACHE_DISABLED env var.
+    Useful to force fresh API responses during debugging.
+    """
+    return bool(os.getenv("LLM_CACHE_DISABLED"))
+
+def make_key(model, full_prompt):
+    """
+    Builds the cache key: sha256 over model + full prompt.
+    Identical (model, prompt) pairs map to the same key across runs.
+    """
+    return hashlib.sha256(f"{model}|{full_prompt}".encode('utf-8')).hexdigest()
+
+def _load():
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if os.path.exists(LLM_CACHE_FILE):
+            try:
+                with open(LLM_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    _cache = json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not read LLM cache file: {e}. Starting empty.")
+                _cache = {}
+    return _cache
+
+def get(key, ttl=DEFAULT_TTL):
+    """
+    Returns the cached response for key, or None on miss/expiry.
+    """
+    if is_disabled():
+        return None
+
+    entry = _load().get(key)
+    if not entry:
+        return None
+
+    if ttl and (time.time() - entry.get("created_at", 0)) > ttl:
+        return None
+
+    return entry.get("response")
+
+def put(key, response):
+    """
+    Stores a response under key and persists the cache to disk.
+    Write failures are logged but never fatal.
+    """
+    if is_disabled():
+        return
+
+    cache = _load()
+    cache[key] = {"response": response, "created_at": time.time()}
+
+    try:
+        with open(LLM_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except Exception as e:
+        logger.warning(f"Could not persist LLM cache: {e}")
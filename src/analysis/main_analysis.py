@@ -1,13 +1,16 @@
 import os
 import sys
-import glob
+import json
 import re
 import argparse
+import functools
 import subprocess
+import shutil
 import tempfile
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 
 # Local modules
 # Add src/analysis to sys.path if running from root
@@ -21,13 +24,13 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 from parse_and_clean import parse_and_clean_discord_txt
-from stats_and_visuals import get_top_contributors_chart, get_activity_heatmap, get_wordcloud_img, get_timeline_chart, get_yap_o_meter_chart, get_night_owls_chart, get_spammer_chart
+from stats_and_visuals import build_all_charts, CHART_BUILDERS
 from ai_insights import get_quarterly_insights, generate_yearly_summary
 try:
-    from html_to_pdf import convert_html_to_pdf
+    from html_to_pdf import convert_html_to_pdf, warm_up_browser
 except ImportError:
     # Just in case imports are weird
-    from src.analysis.html_to_pdf import convert_html_to_pdf
+    from src.analysis.html_to_pdf import convert_html_to_pdf, warm_up_browser
 
 # Import centralized configuration
 from src.config import (
@@ -38,19 +41,89 @@ from src.config import (
     OUTPUT_TXT_DIR,
     ANALYSIS_TEMPLATES_DIR as TEMPLATE_DIR, 
     CLI_PATH,
-    DISCORD_TOKEN_FILE
+    DISCORD_TOKEN_FILE,
+    PARQUET_CACHE_DIR,
+    CHANNEL_NAMES_FILE
 )
 from src.logger import setup_logger
 
 logger = setup_logger("analysis")
 
-def get_channel_name(channel_id, token_path=DISCORD_TOKEN_FILE):
+# The Environment is Jinja's caching unit: built once at import, templates are
+# parsed/compiled at most once per process (and cached to disk across runs via
+# the bytecode cache in the system temp dir). auto_reload is off because
+# templates don't change mid-run.
+_JINJA_ENV = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache()
+)
+
+def format_md_bold(text):
+    """Custom filter: Markdown bold (**text**) to HTML, newlines to <br>."""
+    if not isinstance(text, str): return text
+    # 1. Replace **text** with <strong>text</strong>
+    text = re.sub(r'\*\*(.*?)\*\*', r'<strong class="text-white font-bold">\1</strong>', text)
+    # 2. Replace newlines with <br> to allow spacing within a single block
+    text = text.replace('\n', '<br>')
+    # 3. Handle basic sub-bullets (start of line - )
+    text = re.sub(r'(?:^|<br>)-\s', r'<br>• ', text)
+    return text
+
+_JINJA_ENV.filters['md_bold'] = format_md_bold
+
+# Rendered instead of each chart when the filtered period has no messages —
+# no point spinning up the process pool or plotly for empty figures.
+EMPTY_PLACEHOLDER = '<div class="empty-chart">No data for the selected period</div>'
+
+# Strips every character not safe for a filename in one C-level pass
+# (\w keeps accented letters, matching the old isalnum() behaviour).
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w \-]')
+
+# Discord snowflake IDs embedded in export filenames.
+_CHANNEL_ID_RE = re.compile(r"(\d{17,20})")
+_OUTPUT_TXT_ID_RE = re.compile(r"\d{18}")
+
+# --quarter argument: 'Q3', 'q3' or bare '3'.
+_QUARTER_RE = re.compile(r"^Q?(\d)$", re.IGNORECASE)
+
+def _load_channel_name_cache():
+    """Shared {channel_id: name} cache — same file the web app maintains."""
+    if os.path.exists(CHANNEL_NAMES_FILE):
+        try:
+            with open(CHANNEL_NAMES_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    return {}
+
+def _save_channel_name(channel_id, name):
+    cache = _load_channel_name_cache()
+    cache[channel_id] = name
+    try:
+        with open(CHANNEL_NAMES_FILE, 'w') as f:
+            json.dump(cache, f, indent=2)
+    except Exception as e:
+        logger.warning(f"Could not write channel name cache: {e}")
+
+def start_channel_name_fetch(channel_id, token_path=DISCORD_TOKEN_FILE):
     """
-    Uses DiscordChatExporter.Cli to fetch the channel name.
+    Starts the DiscordChatExporter.Cli channel-name lookup WITHOUT blocking,
+    so the subprocess (network + process startup, seconds) overlaps with the
+    parsing work. Returns a handle for finish_channel_name_fetch, or None
+    when no token is available.
+
+    Known IDs are served from the on-disk cache without launching the CLI at
+    all (batch runs across years hit the same channel every time).
     """
+    cached = _load_channel_name_cache().get(channel_id)
+    if cached:
+        logger.info(f"Using cached channel name: {cached}")
+        return ("cached", cached)
+
     # 1. Environment Variable
     token = os.getenv("DISCORD_TOKEN")
-    
+
     # 2. File Fallback
     if not token:
         if os.path.exists(token_path):
@@ -59,55 +132,123 @@ def get_channel_name(channel_id, token_path=DISCORD_TOKEN_FILE):
                     token = f.read().strip()
             except Exception:
                 pass
-    
+
     if not token:
         logger.warning(f"No Discord token found. Using ID as name.")
-        return f"Channel_{channel_id}"
+        return None
 
     try:
         logger.info(f"Fetching channel name for ID: {channel_id}...")
-        
+
         # Create a temporary directory to avoid polluting the workspace
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # We output to the temp dir with just %n.txt
-            # This ensures we get just the name
-            output_pattern = os.path.join(temp_dir, "%n.txt")
-            
-            cmd = [
-                CLI_PATH, "export",
-                "-t", token,
-                "-c", channel_id,
-                "-o", output_pattern, 
-                "--after", "2099-01-01", # Future date -> 0 messages
-                "--format", "PlainText"
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Check for generated file in temp_dir
-            # The CLI tool will generate a file named "ChannelName.txt"
-            files = os.listdir(temp_dir)
-            if files:
-                filename = files[0]
-                # splitext to remove .txt extension
-                possible_name = os.path.splitext(filename)[0]
-                # If name is empty or just spaces, fallback
-                # Also fallback if it's literally "%n" or generic default
-                if possible_name.strip() and possible_name != "%n":
-                    return possible_name
-            
-            # Fallback strategy: CLI Output Regex
-            combined_output = result.stdout + result.stderr
-            match = re.search(r"Channel '(.+?)' of guild", combined_output)
-            if match:
-                return match.group(1)
+        # (cleaned up in finish_channel_name_fetch)
+        temp_dir = tempfile.mkdtemp()
+        # We output to the temp dir with just %n.txt
+        # This ensures we get just the name
+        output_pattern = os.path.join(temp_dir, "%n.txt")
+
+        cmd = [
+            CLI_PATH, "export",
+            "-t", token,
+            "-c", channel_id,
+            "-o", output_pattern,
+            "--after", "2099-01-01", # Future date -> 0 messages
+            "--format", "PlainText"
+        ]
+
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return (proc, temp_dir)
+
+    except Exception as e:
+        logger.warning(f"Failed to start channel name fetch: {e}")
+        return None
+
+def finish_channel_name_fetch(handle, channel_id):
+    """
+    Waits for a lookup started by start_channel_name_fetch and extracts the
+    channel name. Falls back to Channel_<id> on any failure.
+    """
+    if not handle:
+        return f"Channel_{channel_id}"
+
+    if handle[0] == "cached":
+        return handle[1]
+
+    proc, temp_dir = handle
+    try:
+        stdout, stderr = proc.communicate(timeout=120)
+
+        # Check for generated file in temp_dir
+        # The CLI tool will generate a file named "ChannelName.txt"
+        files = os.listdir(temp_dir)
+        if files:
+            filename = files[0]
+            # splitext to remove .txt extension
+            possible_name = os.path.splitext(filename)[0]
+            # If name is empty or just spaces, fallback
+            # Also fallback if it's literally "%n" or generic default
+            if possible_name.strip() and possible_name != "%n":
+                _save_channel_name(channel_id, possible_name)
+                return possible_name
+
+        # Fallback strategy: CLI Output Regex
+        combined_output = stdout + stderr
+        match = re.search(r"Channel '(.+?)' of guild", combined_output)
+        if match:
+            _save_channel_name(channel_id, match.group(1))
+            return match.group(1)
 
         logger.warning("Could not parse channel name. Fallback to ID.")
         return f"Channel_{channel_id}"
-        
+
     except Exception as e:
+        proc.kill()
         logger.warning(f"Failed to fetch channel name: {e}")
         return f"Channel_{channel_id}"
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+@functools.lru_cache(maxsize=128)
+def get_channel_name(channel_id, token_path=DISCORD_TOKEN_FILE):
+    """
+    Uses DiscordChatExporter.Cli to fetch the channel name (blocking).
+    Memoized per process on top of the on-disk cache.
+    """
+    handle = start_channel_name_fetch(channel_id, token_path)
+    return finish_channel_name_fetch(handle, channel_id)
+
+def load_parsed_dataframe(txt_path):
+    """
+    Cached wrapper around parse_and_clean_discord_txt: the parsed frame is
+    persisted as a parquet sidecar keyed on the input's size+mtime, so
+    re-renders of the same export (e.g. a different --lang or --quarter)
+    load in milliseconds instead of re-running the regex/datetime pipeline.
+    """
+    cache_path = None
+    try:
+        key = f"{os.path.getsize(txt_path)}_{int(os.path.getmtime(txt_path))}"
+        base = os.path.splitext(os.path.basename(txt_path))[0]
+        cache_path = os.path.join(PARQUET_CACHE_DIR, f"{base}.{key}.parquet")
+        if os.path.exists(cache_path):
+            logger.info(f"Loading parsed data from cache: {os.path.basename(cache_path)}")
+            return pd.read_parquet(cache_path)
+    except Exception as e:
+        logger.warning(f"Could not read parquet cache: {e}")
+
+    df = parse_and_clean_discord_txt(txt_path)
+
+    if cache_path and not df.empty:
+        try:
+            df.to_parquet(cache_path, compression='zstd')
+        except Exception:
+            # zstd codec (or pyarrow itself) may be missing; try the default
+            # codec before giving up on caching.
+            try:
+                df.to_parquet(cache_path)
+            except Exception as e:
+                logger.warning(f"Could not write parquet cache: {e}")
+
+    return df
 
 def find_input_file(specific_path=None):
     """
@@ -121,29 +262,36 @@ def find_input_file(specific_path=None):
              return None, None
         target_file = specific_path
     else:
-        # Look for TXT in input/
-        txt_files = glob.glob(os.path.join(INPUT_DIR, "*.txt"))
-        
-        # Check output/txt/
-        if not txt_files:
-             txt_files = glob.glob(os.path.join(OUTPUT_TXT_DIR, "*.txt"))
-        
-        if not txt_files:
-            # Fallback to output/ (dev convenience)
-            txt_files = glob.glob(os.path.join(OUTPUT_DIR, "*.txt"))
-            # Exclude generated reports or thread files
-            txt_files = [f for f in txt_files if "_20" in f or re.search(r"\d{18}", f)]
-        
-        if not txt_files:
+        # Scan input/, output/txt/ then output/ (dev convenience) lazily,
+        # stopping at the first directory with a candidate — one scandir pass
+        # instead of up to three glob() calls that stat every entry.
+        target_file = None
+        for directory, needs_id in ((INPUT_DIR, False), (OUTPUT_TXT_DIR, False), (OUTPUT_DIR, True)):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".txt") or not entry.is_file():
+                            continue
+                        # In output/ only raw exports qualify, not generated
+                        # reports or thread files
+                        if needs_id and "_20" not in entry.name and not _OUTPUT_TXT_ID_RE.search(entry.name):
+                            continue
+                        if target_file is None:
+                            target_file = entry.path
+                        else:
+                            print(f"[WARN] Multiple files found. Using: {target_file}. Use --input to specify.")
+                            break
+            except FileNotFoundError:
+                continue
+            if target_file:
+                break
+
+        if not target_file:
             return None, None
-        
-        target_file = txt_files[0]
-        if len(txt_files) > 1:
-            print(f"[WARN] Multiple files found. Using: {target_file}. Use --input to specify.")
 
     # Extract ID from filename (assuming format ID_Date.txt or just ID...)
     # Regex for 17-19 digit ID
-    match = re.search(r"(\d{17,20})", os.path.basename(target_file))
+    match = _CHANNEL_ID_RE.search(os.path.basename(target_file))
     channel_id = match.group(1) if match else "UnknownID"
     
     return target_file, channel_id
@@ -208,7 +356,9 @@ def main():
     # Assuming ID is at the end preceded by "_" or just the ID itself
     # E.g. "circolo-dei-value-investor_12345.txt"
     name_match = re.search(r"^(.*)_(\d{17,20})\.txt$", base_name)
-    
+
+    channel_name = None
+    name_fetch = None
     if name_match:
         # Extract name part
         potential_name = name_match.group(1)
@@ -216,50 +366,51 @@ def main():
         if potential_name and "%n" not in potential_name:
             channel_name = potential_name
             logger.info(f"Using Channel Name from filename: {channel_name}")
-        else:
-            channel_name = get_channel_name(channel_id)
-            logger.info(f"Resolved Channel Name (via CLI): {channel_name}")
-    else:
-        channel_name = get_channel_name(channel_id)
-        logger.info(f"Resolved Channel Name (via CLI): {channel_name}")
+
+    # Filename didn't carry the name: kick off the CLI lookup NOW and let it
+    # run while we parse/filter/chart — it's collected just before rendering.
+    if channel_name is None:
+        name_fetch = start_channel_name_fetch(channel_id)
 
     # 4. Parse Data & Filter by Year
-    df = parse_and_clean_discord_txt(input_path)
+    df = load_parsed_dataframe(input_path)
     if df.empty:
         logger.warning("DataFrame is empty. Check parsing logic.")
     else:
         # Filter logic
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         total_msgs = len(df)
-        
+
+        # Decompose the timestamp column ONCE via numpy datetime64 arithmetic;
+        # each .dt accessor call would re-scan the full column otherwise.
+        ts_values = df['timestamp'].to_numpy(dtype='datetime64[ns]')
+        years = ts_values.astype('datetime64[Y]').astype('int64') + 1970
+        months = ts_values.astype('datetime64[M]').astype('int64') % 12 + 1
+
         if filter_mode == "months":
              from dateutil.relativedelta import relativedelta
              cutoff_date = datetime.now() - relativedelta(months=args.months)
              # Basic filter
-             df = df[df['timestamp'] >= cutoff_date]
-             
+             df = df[ts_values >= np.datetime64(cutoff_date)]
+
         elif filter_mode == "ytd":
-             df = df[df['timestamp'].dt.year == target_year]
+             df = df[years == target_year]
 
         elif filter_mode == "month_specific":
-             df = df[df['timestamp'].dt.year == target_year]
-             df = df[df['timestamp'].dt.month == target_month]
-             
+             df = df[(years == target_year) & (months == target_month)]
+
         else:
             # Year / Quarter Mode
-            df = df[df['timestamp'].dt.year == target_year]
-            
+            mask = years == target_year
+
             # Filter for Quarter if specified
             if args.quarter:
-                q_clean = args.quarter.strip().upper()
-                if q_clean.startswith('Q') and q_clean[1].isdigit():
-                    target_quarter = int(q_clean[1])
-                elif q_clean.isdigit():
-                    target_quarter = int(q_clean)
-                    
+                q_match = _QUARTER_RE.match(args.quarter.strip())
+                target_quarter = int(q_match.group(1)) if q_match else None
+
                 if target_quarter and 1 <= target_quarter <= 4:
                     print(f"[INFO] Filtering for Quarter {target_quarter}...")
-                    df = df[df['timestamp'].dt.quarter == target_quarter]
+                    mask &= ((months - 1) // 3 + 1) == target_quarter
                     report_suffix = f"_{target_year}_Q{target_quarter}"
                 else:
                      print(f"[WARN] Invalid quarter format '{args.quarter}'. Ignoring.")
@@ -268,6 +419,9 @@ def main():
             else:
                  report_suffix = f"_{target_year}"
 
+            # One boolean-index pass instead of chained year/quarter slices
+            df = df[mask]
+
         filtered_msgs = len(df)
         
         print(f"[INFO] Parsed {total_msgs} total messages.")
@@ -278,13 +432,19 @@ def main():
 
     # 5. Generate Visuals
     logger.info("Generating charts...")
-    top_contributors_html = get_top_contributors_chart(df)
-    activity_heatmap_html = get_activity_heatmap(df)
-    wordcloud_html = get_wordcloud_img(df)
-    timeline_html = get_timeline_chart(df)
-    yap_html = get_yap_o_meter_chart(df)
-    night_owls_html = get_night_owls_chart(df)
-    spammer_html = get_spammer_chart(df)
+    if df.empty:
+        # Already warned above; placeholders instead of seven empty plots.
+        charts = {name: EMPTY_PLACEHOLDER for name in CHART_BUILDERS}
+    else:
+        charts = build_all_charts(df)
+
+    top_contributors_html = charts['top_contributors']
+    activity_heatmap_html = charts['activity_heatmap']
+    wordcloud_html = charts['wordcloud']
+    timeline_html = charts['timeline']
+    yap_html = charts['yap']
+    night_owls_html = charts['night_owls']
+    spammer_html = charts['spammer']
 
     # 5b. AI Insights (Quarterly)
     logger.info(f"Generating AI Quarterly Insights ({args.lang})...")
@@ -378,23 +538,18 @@ def main():
             yearly_summary_text = "AI Analysis failed to generate a summary for this period."
     
     # 6. Render Report
+    # Collect the overlapped channel-name lookup (if one was started).
+    if channel_name is None:
+        channel_name = finish_channel_name_fetch(name_fetch, channel_id)
+        logger.info(f"Resolved Channel Name (via CLI): {channel_name}")
+
     logger.info("Rendering HTML report...")
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    
-    # Custom filter to convert Markdown bold (**text**) to HTML and newlines
-    def format_md_bold(text):
-        if not isinstance(text, str): return text
-        # 1. Replace **text** with <strong>text</strong>
-        text = re.sub(r'\*\*(.*?)\*\*', r'<strong class="text-white font-bold">\1</strong>', text)
-        # 2. Replace newlines with <br> to allow spacing within a single block
-        text = text.replace('\n', '<br>')
-        # 3. Handle basic sub-bullets (start of line - )
-        text = re.sub(r'(?:^|<br>)-\s', r'<br>• ', text)
-        return text
-        
-    env.filters['md_bold'] = format_md_bold
-    
-    template = env.get_template('report_template.html')
+    # Start launching headless Chromium now so its startup overlaps with the
+    # render/write; the PDF step below reuses it.
+    warm_up_browser()
+    # Looked up lazily (not at import) so importing this module never fails
+    # on a missing template; the env caches the compiled result anyway.
+    template = _JINJA_ENV.get_template('report_template.html')
     
     # Construct Report Title
     if filter_mode == "months":
@@ -412,7 +567,7 @@ def main():
         else:
              report_title = f"Report Annuale {target_year}"
 
-    html_content = template.render(
+    render_context = dict(
         channel_name=channel_name,
         report_title=report_title,
         generation_date=datetime.now().strftime("%d %B %Y"),
@@ -429,7 +584,7 @@ def main():
 
     # 7. Save Output
     # Sanitize channel name for filename
-    safe_name = "".join([c for c in channel_name if c.isalnum() or c in (' ', '-', '_')]).strip()
+    safe_name = _UNSAFE_FILENAME_RE.sub('', channel_name).strip()
     if not safe_name: safe_name = f"Channel_{channel_id}"
     
     output_filename = f"{safe_name}_Report{report_suffix}.html"
@@ -438,10 +593,12 @@ def main():
     # OUTPUT_HTML_DIR, OUTPUT_PDF_DIR are imported from config
     
     output_path = os.path.join(OUTPUT_HTML_DIR, output_filename)
-    
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
-        
+
+    # Stream the render straight to disk instead of materializing the whole
+    # report (several MB of embedded plotly JSON + base64 wordcloud) as one
+    # string first.
+    template.stream(**render_context).dump(output_path, encoding="utf-8")
+
     logger.info(f"Report generated: {output_path}")
 
     # 8. Generate PDF
@@ -54,13 +54,11 @@ def test_monthly_analysis():
                  target_year = years[0] # Pick the first available year if 2025 is missing
                  print(f"[WARN] 2025 not found in data. Switching to year {target_year}")
     
-        # Scan for an active month to test
-        sample_month = None
-        for m in range(1, 13):
-            if not df[df['timestamp'].dt.month == m].empty:
-                sample_month = m
-                break
-        
+        # Pick the first populated month in one vectorized pass instead of
+        # scanning the timestamp column up to 12 times
+        months = df['timestamp'].dt.month.dropna()
+        sample_month = int(months.min()) if not months.empty else None
+
         if not sample_month:
             print("[ERROR] No data in any month.")
             return
@@ -1,11 +1,32 @@
 import os
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
 # Base Directory: Root of the project (parent of src/)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Parsed .env contents keyed by (path, mtime_ns), so a reload/re-import only
+# re-parses the file when it actually changed on disk.
+_DOTENV_CACHE = {}
+
+def _load_dotenv_cached(path):
+    """
+    Loads .env into os.environ like load_dotenv(), but caches the parsed
+    dict by file mtime. Existing environment variables are never
+    overridden (same semantics as the plain load_dotenv call).
+    """
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return  # no .env file — nothing to load
+    if key not in _DOTENV_CACHE:
+        _DOTENV_CACHE.clear()
+        _DOTENV_CACHE[key] = dotenv_values(path)
+    for name, value in _DOTENV_CACHE[key].items():
+        if value is not None:
+            os.environ.setdefault(name, value)
+
 # Load environment variables from .env file
-load_dotenv(os.path.join(BASE_DIR, ".env"))
+_load_dotenv_cached(os.path.join(BASE_DIR, ".env"))
 
 # Data Directories
 INPUT_DIR = os.path.join(BASE_DIR, "input")
@@ -41,7 +62,14 @@ WEB_STATIC_DIR = os.path.join(WEB_DIR, "static")
 
 # Cache Files
 CHANNELS_CACHE_FILE = os.path.join(EXTRACTION_RESOURCES_DIR, "channels_cache.json")
+LLM_CACHE_FILE = os.path.join(OUTPUT_DIR, "llm_cache.json")
+MODELS_CACHE_FILE = os.path.join(OUTPUT_DIR, "models_cache.json")
+PARQUET_CACHE_DIR = os.path.join(OUTPUT_DIR, "cache")
 
-# Ensure core directories exist, LOGS_DIR
-for d in [INPUT_DIR, OUTPUT_DIR, OUTPUT_HTML_DIR, OUTPUT_PDF_DIR, OUTPUT_TXT_DIR, EXTRACTION_RESOURCES_DIR]:
-    os.makedirs(d, exist_ok=True)
+# Ensure core directories exist, LOGS_DIR. The _dirs_ready guard keeps
+# importlib.reload() (used by some tests/workers) from re-running the
+# makedirs syscalls; a fresh import still creates everything once.
+if not globals().get('_dirs_ready', False):
+    for d in [INPUT_DIR, OUTPUT_DIR, OUTPUT_HTML_DIR, OUTPUT_PDF_DIR, OUTPUT_TXT_DIR, EXTRACTION_RESOURCES_DIR, PARQUET_CACHE_DIR]:
+        os.makedirs(d, exist_ok=True)
+    _dirs_ready = True
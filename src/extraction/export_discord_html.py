@@ -1,19 +1,27 @@
+import functools
 import subprocess
 import os
 
+# The token never changes within a run, so resolve it once per token_file
+# instead of a stat + read per exported channel.
+@functools.lru_cache(maxsize=4)
 def get_discord_token(token_file='discord_token.txt'):
     # 1. Environment Variable
     token = os.getenv("DISCORD_TOKEN")
     if token:
         return token
-        
+
     # 2. File
     if os.path.isfile(token_file):
         with open(token_file, 'r') as f:
             return f.read().strip()
-            
+
     return None
 
+def clear_token_cache():
+    """Forget memoized tokens (e.g. after rewriting the token file)."""
+    get_discord_token.cache_clear()
+
 def export_discord_html(channel_id, output_html, token_file='discord_token.txt', cli_path='DiscordChatExporterCli/DiscordChatExporter.Cli', after_date=None):
     """
     Export Discord channel messages to HTML using DiscordChatExporter CLI.
@@ -85,19 +93,22 @@ def export_discord_html(channel_id, output_html, token_file='discord_token.txt',
         print(f"[INFO] Starting Discord export for channel {channel_id}...")
         print(f"[INFO] Command: {' '.join(cmd)}")
         
-        # Use Popen to stream output line by line
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        
+        # Use Popen to stream output line by line. Bytes mode: the progress
+        # bar emits thousands of lines we throw away, so filter them on the
+        # raw bytes and only decode the few lines actually printed.
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=-1)
+
         # Print output in real-time, filtering out progress bars
         print("[CLI] Detailed progress hidden to reduce noise (exporting in background)...")
         for line in process.stdout:
             clean_line = line.strip()
-            # Skip progress bar lines (contain block characters or look like percentages only)
-            if "━" in clean_line or (clean_line.endswith("%") and "Warn" not in clean_line):
+            # Skip progress bar lines (contain block characters or look like
+            # percentages only). b"\xe2\x94\x81" is "━" in UTF-8.
+            if b"\xe2\x94\x81" in clean_line or (clean_line.endswith(b"%") and b"Warn" not in clean_line):
                 continue
             if not clean_line:
                 continue
-            print(f"[CLI] {clean_line}")
+            print(f"[CLI] {clean_line.decode('utf-8', errors='replace')}")
             
         process.wait()
         
@@ -1,11 +1,34 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import sys
 import re
 import os
+import mmap
 import argparse
 import datetime
 import glob
 
+# lxml parses the (often huge) export in C; fall back to the stdlib parser
+# when it isn't installed.
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# Only the preamble and the message containers are ever read, so strain
+# everything else away at parse time — no Tag objects get allocated for
+# scripts, styles, avatars and the rest of the markup. Regex rather than a
+# class list so containers with modifier classes (--pinned etc.) still match.
+_MESSAGE_STRAINER = SoupStrainer(
+    'div', class_=re.compile(r'\b(?:chatlog__message-container|preamble)\b'))
+
+# Compiled once at import instead of re-parsed on every call.
+# _TITLE_RE is bytes: it runs over an mmap'd view of the export.
+_LAST_TS_RE = re.compile(r'\[(.*?)\].*?:')
+_TITLE_RE = re.compile(rb'<title>(.*?)</title>', re.IGNORECASE)
+_ID_RE = re.compile(r'_(\d+)\.html$')
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+
 # Setup Logger
 # We need to add project root to path to import src.logger if running as script
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -67,7 +90,7 @@ def get_last_timestamp_from_txt(txt_file):
                 text = line.strip()
                 # Pattern: [DD/MM/YYYY HH:MM] or [DD-MMM-YY HH:MM PM]
                 # We look for the starting bracket and timestamp combo
-                match = re.search(r'\[(.*?)\].*?:', text)
+                match = _LAST_TS_RE.search(text)
                 if match:
                     timestamp_str = match.group(1)
                     
@@ -91,48 +114,177 @@ def get_last_timestamp_from_txt(txt_file):
     
     return None
 
+def _element_classes(elem):
+    """Class tokens of an lxml element (empty list when unset)."""
+    return (elem.get('class') or '').split()
+
+# Compiled XPath lookups for the per-message fields, built once on first
+# use (lxml import is optional, so not at module import). The contains()
+# over a space-padded @class matches the class token regardless of any
+# modifier classes, and the compiled XPath walks the subtree in C instead
+# of a Python iter() per field per message.
+_XPATH_CACHE = None
+
+def _container_xpaths():
+    global _XPATH_CACHE
+    if _XPATH_CACHE is None:
+        from lxml import etree
+
+        def by_class(token):
+            return etree.XPath(
+                "descendant-or-self::*[contains(concat(' ', normalize-space(@class), ' '),"
+                f" ' {token} ')]")
+
+        _XPATH_CACHE = {
+            'message': by_class('chatlog__message'),
+            'author': by_class('chatlog__author'),
+            'timestamp': by_class('chatlog__timestamp'),
+            'content': by_class('chatlog__content'),
+            'attachment': by_class('chatlog__attachment'),
+        }
+    return _XPATH_CACHE
+
+def _find_by_class(elem, xpath):
+    """First match of a compiled class XPath, or None."""
+    found = xpath(elem)
+    return found[0] if found else None
+
+def _element_text(elem):
+    """All descendant text, each chunk stripped and concatenated — same
+    output as BeautifulSoup's get_text(strip=True)."""
+    return ''.join(s.strip() for s in elem.itertext())
+
+def _extract_streaming(html_file, write_message, append_mode):
+    """
+    Streaming extraction with lxml.etree.iterparse: each message container
+    is handled as soon as its closing tag is seen and then freed, so the
+    working set stays O(one message) instead of the whole DOM — on multi-GB
+    exports this is the difference between streaming and swapping.
+    Returns the number of messages written.
+    """
+    from lxml import etree
+
+    messages_count = 0
+    preamble_done = append_mode  # duplicate headers are skipped on append
+    xp = _container_xpaths()
+    context = etree.iterparse(html_file, html=True, events=('end',), tag='div')
+    for _, elem in context:
+        classes = _element_classes(elem)
+
+        if 'preamble' in classes and not preamble_done:
+            # Estrai informazioni dal preamble (intestazione canale)
+            entries = [e for e in elem.iter('div')
+                       if 'preamble__entry' in _element_classes(e)]
+            if entries:
+                channel_info = " / ".join(_element_text(e) for e in entries)
+                header = f"CANALE: {channel_info}\n{'='*80}\n\n"
+                write_message(header)
+            preamble_done = True
+        elif 'chatlog__message-container' in classes:
+            message_div = _find_by_class(elem, xp['message'])
+            if message_div is not None:
+                # Autore (fallback "Sconosciuto" come nel percorso DOM)
+                author = _find_by_class(message_div, xp['author'])
+                author_name = _element_text(author) if author is not None else "Sconosciuto"
+
+                # Timestamp, wrapped in brackets for parse_and_clean.py
+                timestamp_span = _find_by_class(message_div, xp['timestamp'])
+                timestamp_str = f"[{_element_text(timestamp_span)}]" if timestamp_span is not None else ""
+
+                # Contenuto
+                content_div = _find_by_class(message_div, xp['content'])
+                content_text = _element_text(content_div) if content_div is not None else ""
+
+                # Allegati
+                if _find_by_class(message_div, xp['attachment']) is not None:
+                    if not content_text:
+                        content_text = "<Attachment/Image>"
+                    else:
+                        content_text += " <Attachment>"
+
+                if timestamp_str and author_name:
+                    write_message(f"{timestamp_str} {author_name}: {content_text}")
+                    messages_count += 1
+                    if messages_count % 1000 == 0:
+                        logger.debug(f"Processed {messages_count} messages...")
+        else:
+            # Inner div of a still-open container: leave it alone, the
+            # container's own end event will free it.
+            continue
+
+        # Standard lxml fast-iter cleanup: drop the handled element and
+        # every already-processed sibling before it.
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    del context
+    return messages_count
+
 def extract_discord_messages(html_file, output_file=None, append_mode=False):
     """
     Estrae i messaggi da un file HTML esportato da DiscordChatExporter
-    
+
     Args:
         html_file: percorso del file HTML di input
         output_file: percorso del file di output (opzionale)
         append_mode: se True, appende al file di output esistente
-    
+
     Returns:
         stringa con il testo estratto
     """
-    
+
     if not os.path.exists(html_file):
         logger.error(f"File not found: {html_file}")
         return ""
 
     logger.info(f"Reading HTML file: {html_file}...")
-    
-    # Use Streaming parsing where possible (pass file handler)
-    with open(html_file, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f, 'html.parser')
-    
-    logger.info("HTML Structure parsed. Processing messages...")
-    
+
     # Setup Output Stream
     out_f = None
     extracted_buffer_legacy = [] # Fallback if no output_file
-    
+
     mode = 'a' if append_mode else 'w'
-    
+
     if output_file:
-        out_f = open(output_file, mode, encoding='utf-8')
+        # 1MB buffer: a syscall every megabyte instead of every message
+        out_f = open(output_file, mode, encoding='utf-8', buffering=1 << 20)
         if append_mode:
             out_f.write(f"\n\n--- INCREMENTAL UPDATE: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---\n\n")
-    
+
+    # Batch messages and hand them to writelines in blocks, amortizing the
+    # per-message Python call + "+\n" concat over millions of lines.
+    _write_buf = []
+
     def write_message(text):
         if out_f:
-            out_f.write(text + "\n")
+            _write_buf.append(text)
+            _write_buf.append("\n")
+            if len(_write_buf) >= 8192:
+                out_f.writelines(_write_buf)
+                _write_buf.clear()
         else:
             extracted_buffer_legacy.append(text)
 
+    def _flush_writes():
+        if out_f and _write_buf:
+            out_f.writelines(_write_buf)
+            _write_buf.clear()
+
+    if _HTML_PARSER == 'lxml':
+        messages_count = _extract_streaming(html_file, write_message, append_mode)
+        if out_f:
+            _flush_writes()
+            out_f.close()
+            logger.info(f"Salvato output in {output_file} ({messages_count} messaggi)")
+            return ""
+        return "\n".join(extracted_buffer_legacy)
+
+    # DOM fallback without lxml: strained BeautifulSoup parse.
+    with open(html_file, 'r', encoding='utf-8') as f:
+        soup = BeautifulSoup(f, _HTML_PARSER, parse_only=_MESSAGE_STRAINER)
+
+    logger.info("HTML Structure parsed. Processing messages...")
+
     # Estrai informazioni dal preamble (intestazione canale)
     # If appending, maybe skip header? Or keep it as separator?
     # Usually clean to keep context or maybe minimal separator.
@@ -219,6 +371,7 @@ def extract_discord_messages(html_file, output_file=None, append_mode=False):
              messages_count += 1
              
     if out_f:
+        _flush_writes()
         out_f.close()
         logger.info(f"Salvato output in {output_file} ({messages_count} messaggi)")
         return ""
@@ -327,30 +480,33 @@ if __name__ == "__main__":
                 if "%n" in base_name:
                      print("[WARN] CLI failed to replace channel name placeholder. Attempting to fix filename...")
                      try:
-                         # Read preamble to find real name
-                         # We can't trust full parse yet, just peek
-                         with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-                             chunk = f.read(8192) # 8KB
-                             
-                         # Try to find title
-                         title_match = re.search(r'<title>(.*?)</title>', chunk, re.IGNORECASE)
+                         # Read preamble to find real name. The <title> sits
+                         # in the first few hundred bytes, so scan a bounded
+                         # window of an mmap'd view — no 8KB str allocated
+                         # and decoded just to throw it away.
+                         with open(input_path, 'rb') as f:
+                             with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                                 # Decode only the captured group, before the
+                                 # mmap (which backs the match) is closed.
+                                 title_match = _TITLE_RE.search(mm, 0, 8192)
+                                 full_title = title_match.group(1).decode('utf-8', errors='replace').strip() if title_match else None
+
                          real_name = "Unknown_Channel"
-                         
-                         if title_match:
-                             full_title = title_match.group(1).strip()
+
+                         if full_title:
                              # Format: "Guild - Channel"
                              parts = full_title.split(' - ')
                              if len(parts) > 1:
                                  real_name = parts[-1].strip()
                              else:
                                  real_name = full_title
-                         
+
                          # Sanitize
-                         real_name = re.sub(r'[<>:"/\\|?*]', '_', real_name).strip()
+                         real_name = _SANITIZE_RE.sub('_', real_name).strip()
                          
                          # reconstruct filename: Name_ID.html
                          # Extract ID from current filename "%n_ID.html"
-                         id_match = re.search(r'_(\d+)\.html$', base_name)
+                         id_match = _ID_RE.search(base_name)
                          chan_id = id_match.group(1) if id_match else args.export
                          
                          new_filename = f"{real_name}_{chan_id}.html"
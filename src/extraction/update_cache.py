@@ -2,6 +2,7 @@ import os
 import sys
 import json
 import argparse
+import functools
 import subprocess
 import asyncio
 
@@ -10,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from src.config import CLI_PATH, DISCORD_TOKEN_FILE, CHANNELS_CACHE_FILE
 
+@functools.lru_cache(maxsize=1)
 def get_discord_token():
     token = os.getenv("DISCORD_TOKEN")
     if token:
@@ -159,17 +159,28 @@ async def resolve_names(request: NameResolutionRequest):
         
     return {"status": "success", "names": results}
 
+# Token resolved from file once per process; the env var still wins on
+# every call and a missing file is NOT cached, so dropping the token file
+# in while the app is running works without a restart.
+_token_cache = None
+
 def get_discord_token():
+    global _token_cache
     # 1. Environment Variable
     token = os.getenv("DISCORD_TOKEN")
     if token:
         return token
 
-    # 2. File
-    if not os.path.exists(TOKEN_FILE):
-        return None
-    with open(TOKEN_FILE, 'r') as f:
-        return f.read().strip()
+    # 2. File (read at most once)
+    if _token_cache is None and os.path.exists(TOKEN_FILE):
+        with open(TOKEN_FILE, 'r') as f:
+            _token_cache = f.read().strip()
+    return _token_cache
+
+def clear_token_cache():
+    """Forget the memoized token (e.g. after the token file was replaced)."""
+    global _token_cache
+    _token_cache = None
 
 def _run_cli_command_sync(args, timeout=60):
     """